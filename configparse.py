@@ -1,14 +1,31 @@
 import configparser
 class ConfigParser:
 
-    # @staticmethod
-    def read_config(config_name,section):
-            try:
-                config  = configparser.RawConfigParser()   
+    _config = None
+
+    @classmethod
+    def _ensure_loaded(cls):
+            if cls._config is None:
+                cls._config = configparser.RawConfigParser()
                 configFilePath = 'app.config'
-                config.read(configFilePath)
-                rConfig = config[config_name][section]
+                cls._config.read(configFilePath)
+
+    @classmethod
+    def read_config(cls,config_name,section):
+            try:
+                cls._ensure_loaded()
+                rConfig = cls._config[config_name][section]
             except Exception as error:
                 print("Exception ocuured in Read Section {} {}".format(config_name,section))
                 raise Exception("Not valid config name or section")
-            return(rConfig)
\ No newline at end of file
+            return(rConfig)
+
+    @classmethod
+    def read_section(cls,section):
+            try:
+                cls._ensure_loaded()
+                rSection = dict(cls._config[section])
+            except Exception as error:
+                print("Exception ocuured in Read Section {}".format(section))
+                raise Exception("Not valid section")
+            return(rSection)
@@ -0,0 +1,9 @@
+# Run with: gunicorn -c gunicorn_conf.py main:app
+# The workload is I/O-bound on LLM and backend calls, so threaded workers
+# overlap requests well; preload_app shares the imported module across forks.
+bind = "0.0.0.0:8008"
+workers = 4
+threads = 16
+worker_class = "gthread"
+preload_app = True
+timeout = 120
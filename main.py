@@ -1,243 +1,356 @@
+import os
+import re
+import types
+import hashlib
+import logging
+import pathlib
+import functools
+import concurrent.futures
+
 import autogen
+import orjson
+import redis
+from cachetools import TTLCache
 import requests
+import urllib3
+from urllib3.util.retry import Retry
 from flask_cors import CORS
 from typing import Annotated
 from configparse import ConfigParser
 from flask import Flask, request, jsonify
+from flask_orjson import OrjsonProvider
+
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+log = logging.getLogger(__name__)
 
 app = Flask(__name__)
+# Route request.get_json()/jsonify through orjson; the chat-history responses
+# can be large and stdlib json serialization is the slow path
+app.json = OrjsonProvider(app)
 CORS(app, resources={r"/*": {"origins": "*"}})
 
-# Load model routes from config
-config = ConfigParser
-
-ROUTES = {
-    "OFD": config.read_config("model_routes", "OFD"),
-    "TKG": config.read_config("model_routes", "TKG"),
-    "CAUSAL": config.read_config("model_routes", "CAUSAL")
-}
-
-config_list = autogen.config_list_from_json(
-    env_or_file="OAI_CONFIG_LIST.json",
-    filter_dict={"model": ["llama-3.3-70b-versatile"]},
+# Load all model routes from config in one go; normalize the URLs once (the
+# config values are quoted) and freeze the mapping so execute_task only needs a
+# plain dict lookup per call. Adding a category is now an app.config-only change.
+ROUTES = types.MappingProxyType({
+    k.upper(): v.strip("'\" ").rstrip("/")
+    for k, v in ConfigParser.read_section("model_routes").items()
+})
+
+# Shared HTTP session so repeated sub-queries reuse pooled keep-alive connections
+# instead of opening a fresh TCP/TLS connection per call
+_SESSION = requests.Session()
+_adapter = requests.adapters.HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
 )
-
-llm_config = {
-    "cache_seed": 42,
-    "config_list": config_list,
-    "temperature": 0.2,
-    "api_type": "groq",
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+_SESSION.headers.update({'Content-Type': 'application/json'})
+# The backends use self-signed certs; disable verification once on the session
+# and silence the InsecureRequestWarning that would otherwise be formatted and
+# written to stderr on every call
+_SESSION.verify = False
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# In-process cache of backend responses keyed on (category, normalized query);
+# identical sub-queries recur across turns, so a hit skips the model call entirely.
+# Set EXECUTE_CACHE=0 to bypass when debugging backend behaviour.
+_RESP_CACHE = TTLCache(maxsize=1024, ttl=600)
+_CACHE_ENABLED = os.getenv("EXECUTE_CACHE", "1") != "0"
+
+# Optional Redis L2 behind the in-process L1, so cache hits are shared across
+# gunicorn workers and replicas; enabled by setting REDIS_HOST
+_REDIS = redis.Redis(host=os.environ["REDIS_HOST"]) if "REDIS_HOST" in os.environ else None
+
+def _shared_cache_key(category, query_norm):
+    return b"ex:" + hashlib.blake2b(f"{category}|{query_norm}".encode(), digest_size=16).digest()
+
+def _shared_cache_get(category, query_norm):
+    if _REDIS is None:
+        return None
+    try:
+        cached = _REDIS.get(_shared_cache_key(category, query_norm))
+    except redis.RedisError as e:
+        log.debug("Redis get failed: %s", e)
+        return None
+    return orjson.loads(cached) if cached is not None else None
+
+def _shared_cache_set(category, query_norm, body):
+    if _REDIS is None:
+        return
+    try:
+        _REDIS.set(_shared_cache_key(category, query_norm), orjson.dumps(body), ex=600)
+    except redis.RedisError as e:
+        log.debug("Redis set failed: %s", e)
+
+# Shared prefix for every agent's system message. Providers with server-side
+# prompt caching match on identical prefixes, so the common context lives here
+# and per-agent specialization goes after it.
+SHARED_PREAMBLE = """You are one of five cooperating agents (planner, decomposer, classifier, executor, aggregator) in a multi-agent query-routing system. User queries are decomposed into sub-queries, each classified into one of three categories: OFD (Ontological Functional Dependency), TKG (Temporal Knowledge Graph) or CAUSAL (Cause and Effect), then routed to the matching model backend and the responses aggregated into a final answer. Stay strictly within your own role and hand off to the next agent as instructed."""
+
+# Keyword cues per category, used to classify without an LLM call where the
+# signal is unambiguous and to recover sub-queries the model mislabelled
+_KW = {
+    "OFD": re.compile(r"\b(entit|attribut|depend|relation|schema|dataset)", re.I),
+    "TKG": re.compile(r"\b(year|decade|over time|trend|19\d\d|20\d\d|history|evolv)", re.I),
+    "CAUSAL": re.compile(r"\b(caus|effect|impact|why|because|lead to|counterfactual)", re.I),
 }
 
-# Define the planner agent
-planner_agent = autogen.ConversableAgent(
-    name="planner_agent",
-    system_message="""
-    I am the planner agent, I am an expert in planning and orchestrating the workflow of the system. I do the following tasks:
-    1. I take the user input/user query and then send it to the decomposer agent.
-    2. The decomposer agent then sends back the decomposed queries.
-    3. I then send the decomposed queries to the classifier agent.
-    """,
-    llm_config=llm_config
-)
-
-# Define the decomposer agent
-decomposer_agent = autogen.ConversableAgent(
-    name="decomposer_agent",
-    system_message="""
-    I am the decomposer agent, I am an expert in decomposing the user query into smaller sub-queries, I don't answer the user query, I just decompose it. I do the following tasks:
-    1. I take the user input/user query from the planner agent and then decompose it into smaller sub-queries.
-    2. I create a list where the very first item is the original user input (main question), followed by the decomposed sub-queries.
-    3. I send this list of queries back to the planner agent, formatted as a single string with each query on a new line, prefixed with 'query:' (e.g., 'query:Original user question\nquery:Sub-query 1\nquery:Sub-query 2').
-    """,
-    llm_config=llm_config
-)
-
-# Define the classifier agent
-classifier_agent = autogen.ConversableAgent(
-    name="classifier_agent",
-    system_message=""" 
-    I am the classifier agent, I am an expert in classifying tasks into different categories, 
-    I don't answer the sub-queries, I just classify them. I do the following tasks:
-
-    1. I take the decomposed sub-queries from the decomposer agent or planner agent and then classify them into different categories.
-    I will strictly classify the sub-queries into these categories:
-
-        1.1. **OFD (Ontological Functional Dependency)**:
-            Questions focus on identifying entities, attributes, and their functional dependencies within a dataset, 
-            as well as how entities relate and influence each other.
-
-            **Key Traits**:
-            - Entity/Attribute Identification
-            - Dependency Discovery (how entities depend on each other)
-            - Relationship Analysis
-            - Dataset-Based Reasoning (identifying patterns and dependencies)
-
-            **Examples**:
-            - What are the entities and attributes in this dataset?
-            - How do entities depend on each other?
-            - What functional dependencies exist between attributes?
-
-            **Classification**: If the query focuses on relationships, dependencies, or dataset-based reasoning, classify it as OFD.
-
-        1.2. **TKG (Temporal Knowledge Graph)**:
-            Questions focus on time-based reasoning, event progression, and relationships evolving over time.
-
-            **Key Traits**:
-            - Time-based Reasoning (how entities/events evolve)
-            - Event Progression (sequences of events or changes over time)
-            - Time-constrained Facts (valid info at specific times)
-            - Temporal Causal Sequences (cause and effect with timestamps)
-
-            **Examples**:
-            - What was the market trend from 2020-2023?
-            - How did mergers affect stock prices over the past decade?
-            - Who were the US presidents in the 1990s?
-
-            **Classification**: If the query involves time or evolving relationships, classify it as TKG.
-
-        1.3. **CAUSAL (Causal Question)**:
-            Questions focus on understanding cause-and-effect relationships between variables.
-
-            **Key Traits**:
-            - Cause-and-Effect Relationships
-            - Counterfactual Reasoning (what would happen if X didn't occur?)
-            - Intervention Scenarios (how changes in X impact Y)
-            - Causal Mechanisms (how X leads to Y)
-            - Temporal Precedence (did X occur before Y, and does it influence Y?)
-
-            **Examples**:
-            - How does temperature affect CPU performance?
-            - What is the impact of sanctions on GDP?
-            - If a player is substituted, how does it affect the team's win probability?
-
-            **Classification**: If the query involves cause-and-effect or intervention, classify it as CAUSAL.
-
-    2. I send the classified sub-queries to the executor agent.
-    
-    I classify sub-queries into: OFD, TKG, or CAUSAL. 
-    I return each sub-query in the format 'category:<category>, query:<sub-query_text>'.
-    """,
-    llm_config=llm_config
-)
-
+def fast_classify(query):
+    """Keyword-based classifier; returns (category, confidence in [0, 1]).
 
-# Define the executor agent with function calling capability
-executor_agent = autogen.ConversableAgent(
-    name="executor_agent",
-    system_message="""
-    I am the executor agent. I specialize in routing classified sub-queries to their appropriate endpoints by calling the execute_task function for each sub-query. 
-    I never answer the classified sub-queries myself. My only job is to route them correctly and wait for responses. Once I have received all the responses, I will pass them to the aggregator_agent by saying '@aggregator_agent, here are the responses: [list of responses]'. I do not provide any final answer or summary; that is the role of the aggregator_agent.
-
-    I route classified sub-queries to their endpoints using execute_task and collect responses. After receiving all responses, I pass them to the aggregator_agent with '@aggregator_agent, here are the responses: [list]' and say 'Task complete. aggregator_agent, please proceed to perform your tasks' to ensure the conversation continues.
-
-    Here are the correct routes:
-     - **OFD (Ontological Functional Dependency):** {ROUTES['OFD']}
-     - **TKG (Temporal Knowledge Graph):** {ROUTES['TKG']}
-     - **CAUSAL (Cause and Effect):** {ROUTES['CAUSAL']}
-
-    Responsibilities:
-    1. I take the classified sub-queries from the classifier agent.
-    2. For each sub-query, I call execute_task with the classified sub-query string and wait for the response.
-    3. After all responses are received, I compile them and pass them to the aggregator_agent using the format '@aggregator_agent, here are the responses: [response1], [response2], ...'
-    4. I collect all the responses and pass them to the aggregator_agent for further processing.
-    5. I do not provide any final answer or summary; that is the role of the aggregator_agent.
-    """,
-    llm_config=llm_config
-)
-
-# Define the aggregator agent
-aggregator_agent = autogen.ConversableAgent(
-    name="aggregator_agent",
-    system_message="""
-    I am the aggregator agent, I am expert in aggregating the different category responses. I never answer the sub-queries myself; I just aggregate the responses. I do the following tasks:
-    1. I wait until the executor agent has processed all sub-queries and their responses are available in the chat history.
-    2. I collect all the responses from the executor agent.
-    3. I prepare a final response that starts with 'The final answer is:' followed by a summary of all the answers received from the executor agent.
-    4. My final response must always begin with 'The final answer is:' to clearly indicate the conclusion.
-
-    I wait for the executor_agent to send '@aggregator_agent, here are the responses:' followed by a list. I then summarize the responses and provide a final answer starting with 'The final answer is:' , marking the end of the conversation.
-    """,
-    llm_config=llm_config,
-    human_input_mode="NEVER"
-)
+    Returns (None, 0.0) when no category keywords match, in which case the
+    caller should fall back to the LLM classifier.
+    """
+    scores = {cat: len(pattern.findall(query)) for cat, pattern in _KW.items()}
+    total = sum(scores.values())
+    if total == 0:
+        return None, 0.0
+    best = max(scores, key=scores.get)
+    return best, scores[best] / total
 
 # Define the execute_task function
 def execute_task(classified_task: Annotated[str, "The classified sub-query in the format 'category:<category>, query:<sub-query_text>'"]) -> dict:
     """Executes a task based on classification, sending sub-queries to model endpoints."""
     try:
-        # Debug: Print the classified task to verify input
-        print(f"Classified task received: {classified_task}")
-
-        # Extract category and query from the string
-        if "category:" not in classified_task or "query:" not in classified_task:
+        log.debug("Classified task received: %s", classified_task)
+
+        # Extract category and query from 'category:<category>, query:<sub-query_text>';
+        # str.partition does a single scan per marker with no intermediate lists
+        _, found_cat, rest = classified_task.partition("category:")
+        category, sep, rest = rest.partition(",")
+        _, found_query, query = rest.partition("query:")
+        if not (found_cat and sep and found_query):
             return {"error": "Malformed classified task"}
 
-        category_part = classified_task.split("category:")[1].split(",")[0].strip()
-        query_part = classified_task.split("query:")[1].strip()
+        category = category.strip()
+        query = query.strip()
 
-        category = category_part
-        query = query_part
-
-        # Debug: Print category and query to verify parsing
-        print(f"Category: {category}, Query: {query}")
+        log.debug("Category: %s, Query: %s", category, query)
 
         if category not in ROUTES:
-            return {"error": f"Invalid category: {category}"}
-
-        # Strip any leading or trailing quotes from the route URL
-        route_url = ROUTES[category].strip("'\"") # Remove single and double quotes and \ since we only send / in the route
-        print(f"Sending to route: {route_url}")
+            # Recover mislabelled sub-queries locally rather than bouncing an
+            # error back through another LLM round-trip
+            guess, confidence = fast_classify(query)
+            if guess is None or confidence < 0.5:
+                return {"error": f"Invalid category: {category}"}
+            category = guess
+
+        cache_key = (category, " ".join(query.lower().split()))
+        if _CACHE_ENABLED:
+            if cache_key in _RESP_CACHE:
+                return _RESP_CACHE[cache_key]
+            shared = _shared_cache_get(*cache_key)
+            if shared is not None:
+                _RESP_CACHE[cache_key] = shared
+                return shared
+
+        route_url = ROUTES[category]
+        log.debug("Sending to route: %s", route_url)
 
         # Send query to external service
         payload = {"query": query}
-        headers = {'Content-Type': 'application/json'}
 
-        response = requests.post(route_url, json=payload, headers=headers, verify=False)
+        response = _SESSION.post(route_url, json=payload, timeout=(3, 30))
         response.raise_for_status()
-        
-        print(f"Response from {route_url}: {response.json()}")
-        return response.json()
+
+        body = response.json()
+        log.debug("Response from %s: %s", route_url, body)
+        if _CACHE_ENABLED:
+            # only successful responses are cached
+            _RESP_CACHE[cache_key] = body
+            _shared_cache_set(*cache_key, body)
+        return body
 
     except requests.exceptions.RequestException as e:
         return {"error": f"Request failed: {str(e)}"}
     except Exception as e:
-        return {"error": f"Execution error: {str(e)}"}    
-
-# Register the function for both LLM and execution on executor_agent
-executor_agent.register_for_llm(name="execute_task", description="Execute a classified sub-query by sending it to the appropriate external model and returning the response")(execute_task)
-executor_agent.register_for_execution(name="execute_task")(execute_task)
-
-# Create a GroupChat with all existing agents
-groupchat = autogen.GroupChat(
-    agents=[
-        planner_agent,
-        decomposer_agent,
-        classifier_agent,
-        executor_agent,
-        aggregator_agent
-    ],
-    messages=[]
-)
+        return {"error": f"Execution error: {str(e)}"}
+
+# Thread pool for fanning out independent sub-queries to their backends concurrently
+_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+
+def execute_tasks(classified_tasks: Annotated[list[str], "The full list of classified sub-queries, each in the format 'category:<category>, query:<sub-query_text>'"]) -> list:
+    """Executes multiple classified sub-queries concurrently, returning responses in order."""
+    return list(_POOL.map(execute_task, classified_tasks))
+
+class BoundedGroupChat(autogen.GroupChat):
+    """GroupChat with a sliding window over its message history.
+
+    Every LLM call re-sends all accumulated messages as context, so an
+    unbounded history makes token cost grow quadratically across the
+    conversation. This keeps the opening messages (the user query and the
+    planner's kickoff) plus the most recent turns and drops the middle.
+    """
+
+    KEEP_FIRST = 2
+    MAX_MESSAGES = 20
+
+    def append(self, message, speaker):
+        super().append(message, speaker)
+        if len(self.messages) > self.MAX_MESSAGES:
+            keep_last = self.MAX_MESSAGES - self.KEEP_FIRST
+            del self.messages[self.KEEP_FIRST:len(self.messages) - keep_last]
 
 def is_termination_msg(message):
     # Stop if the message is from aggregator_agent and contains "The final answer is:" anywhere in the content
     return message["name"] == "aggregator_agent" and "The final answer is:" in message["content"].strip()
 
-manager = autogen.GroupChatManager(groupchat=groupchat, llm_config=llm_config, is_termination_msg=is_termination_msg)
-
-def process_query(user_input):
+@functools.lru_cache(maxsize=1)
+def _build_manager():
+    """Builds the agents, group chat and manager once, on first use.
+
+    Keeping this out of module scope means importing main.py (e.g. in a
+    gunicorn worker fork) does not pay for LLM-config validation and agent
+    construction before the server can bind its port.
+    """
+    # Read the config list directly; the autogen helper also does globbing and
+    # env-var fallbacks we do not use, and stdlib json is slower than orjson
+    all_configs = orjson.loads(pathlib.Path("OAI_CONFIG_LIST.json").read_bytes())
+    config_list = [c for c in all_configs if c.get("model") == "llama-3.3-70b-versatile"]
+
+    llm_config = {
+        "cache_seed": 42,
+        "config_list": config_list,
+        "temperature": 0.2,
+        "api_type": "groq",
+    }
+
+    # Define the planner agent
+    planner_agent = autogen.ConversableAgent(
+        name="planner_agent",
+        system_message=SHARED_PREAMBLE + """
+
+        I am the planner agent, I am an expert in planning and orchestrating the workflow of the system. I do the following tasks:
+        1. I take the user input/user query and then send it to the decomposer agent.
+        2. The decomposer agent then sends back the decomposed queries.
+        3. I then send the decomposed queries to the classifier agent.
+        """,
+        llm_config=llm_config
+    )
+
+    # Define the decomposer agent
+    decomposer_agent = autogen.ConversableAgent(
+        name="decomposer_agent",
+        system_message=SHARED_PREAMBLE + """
+
+        I am the decomposer agent, I am an expert in decomposing the user query into smaller sub-queries, I don't answer the user query, I just decompose it. I do the following tasks:
+        1. I take the user input/user query from the planner agent and then decompose it into smaller sub-queries.
+        2. I create a list where the very first item is the original user input (main question), followed by the decomposed sub-queries.
+        3. I send this list of queries back to the planner agent, formatted as a single string with each query on a new line, prefixed with 'query:' (e.g., 'query:Original user question\nquery:Sub-query 1\nquery:Sub-query 2').
+        """,
+        llm_config=llm_config
+    )
+
+    # Define the classifier agent
+    classifier_agent = autogen.ConversableAgent(
+        name="classifier_agent",
+        system_message=SHARED_PREAMBLE + """
+
+        I am the classifier agent, I am an expert in classifying tasks into different categories,
+        I don't answer the sub-queries, I just classify them. I do the following tasks:
+
+        1. I take the decomposed sub-queries from the decomposer agent or planner agent and strictly classify each into one of these categories:
+            - **OFD (Ontological Functional Dependency)**: entities, attributes, functional dependencies and how entities relate within a dataset (e.g. 'What functional dependencies exist between attributes?').
+            - **TKG (Temporal Knowledge Graph)**: time-based reasoning, event progression and relationships evolving over time (e.g. 'What was the market trend from 2020-2023?').
+            - **CAUSAL (Causal Question)**: cause-and-effect relationships, counterfactuals and intervention scenarios (e.g. 'What is the impact of sanctions on GDP?').
+        2. I send the classified sub-queries to the executor agent.
+
+        I return each sub-query in the format 'category:<category>, query:<sub-query_text>'.
+        """,
+        llm_config=llm_config
+    )
+
+
+    # Define the executor agent with function calling capability
+    executor_agent = autogen.ConversableAgent(
+        name="executor_agent",
+        system_message=SHARED_PREAMBLE + """
+
+        I am the executor agent. I specialize in routing classified sub-queries to their appropriate endpoints by calling the execute_tasks function.
+        I never answer the classified sub-queries myself. My only job is to route them correctly and wait for responses. Once I have received all the responses, I will pass them to the aggregator_agent by saying '@aggregator_agent, here are the responses: [list of responses]'. I do not provide any final answer or summary; that is the role of the aggregator_agent.
+
+        I ALWAYS call execute_tasks exactly once with the full list of classified sub-queries -- I never loop calling execute_task one-by-one. After receiving all responses, I pass them to the aggregator_agent with '@aggregator_agent, here are the responses: [list]' and say 'Task complete. aggregator_agent, please proceed to perform your tasks' to ensure the conversation continues.
+
+        The valid categories are OFD (Ontological Functional Dependency), TKG (Temporal Knowledge Graph) and CAUSAL (Cause and Effect); the routing to the actual endpoints is handled by the tools themselves.
+
+        Responsibilities:
+        1. I take the classified sub-queries from the classifier agent.
+        2. I call execute_tasks ONCE with the complete list of classified sub-query strings (even if there is only one) and wait for the list of responses.
+        3. After all responses are received, I compile them and pass them to the aggregator_agent using the format '@aggregator_agent, here are the responses: [response1], [response2], ...'
+        4. I do not provide any final answer or summary; that is the role of the aggregator_agent.
+        """,
+        llm_config=llm_config
+    )
+
+    # Define the aggregator agent
+    aggregator_agent = autogen.ConversableAgent(
+        name="aggregator_agent",
+        system_message=SHARED_PREAMBLE + """
+
+        I am the aggregator agent, I am expert in aggregating the different category responses. I never answer the sub-queries myself; I just aggregate the responses. I do the following tasks:
+        1. I wait until the executor agent has processed all sub-queries and their responses are available in the chat history.
+        2. I collect all the responses from the executor agent.
+        3. I prepare a final response that starts with 'The final answer is:' followed by a summary of all the answers received from the executor agent.
+        4. My final response must always begin with 'The final answer is:' to clearly indicate the conclusion, marking the end of the conversation.
+        """,
+        llm_config=llm_config,
+        human_input_mode="NEVER"
+    )
+
+    # Register the functions for both LLM and execution on executor_agent
+    executor_agent.register_for_llm(name="execute_task", description="Execute a classified sub-query by sending it to the appropriate external model and returning the response")(execute_task)
+    executor_agent.register_for_execution(name="execute_task")(execute_task)
+    executor_agent.register_for_llm(name="execute_tasks", description="Execute the full list of classified sub-queries in one call; the sub-queries run concurrently and the responses come back in the same order")(execute_tasks)
+    executor_agent.register_for_execution(name="execute_tasks")(execute_tasks)
+
+    # Create a GroupChat with all existing agents; the window and round cap
+    # bound per-call context size and total orchestration turns
+    groupchat = BoundedGroupChat(
+        agents=[
+            planner_agent,
+            decomposer_agent,
+            classifier_agent,
+            executor_agent,
+            aggregator_agent
+        ],
+        messages=[],
+        max_round=12
+    )
+
+    manager = autogen.GroupChatManager(groupchat=groupchat, llm_config=llm_config, is_termination_msg=is_termination_msg)
+    return manager, planner_agent
+
+def process_query(user_input, verbose=False):
     """Processes the user input through the multi-agent system."""
     try:
+        manager, planner_agent = _build_manager()
         result = manager.initiate_chat(
             planner_agent,  # Start with the planner here manager/chat_manager is taking the user_query/input and sending it to the planner agent
             message=f"User query: {user_input}"
         )
-        return {"result": result.chat_history}  # Return chat history for clarity
+        if verbose:
+            return {"result": result.chat_history}  # Full history for debugging
+
+        # Only the aggregator's conclusion matters to the caller; returning the
+        # whole chat history serializes every intermediate agent turn
+        final = next(
+            (m["content"] for m in reversed(result.chat_history)
+             if m.get("name") == "aggregator_agent" and "The final answer is:" in m.get("content", "")),
+            None
+        )
+        return {"final_answer": final, "turns": len(result.chat_history)}
 
     except Exception as e:
         return {"error": str(e)}
 
+@app.route("/healthz", methods=["GET"])
+def healthz():
+    """Liveness probe; must not trigger the lazy agent construction."""
+    return jsonify({"status": "ok"}), 200
+
 @app.route("/user_query", methods=["POST"])
 def user_query():
     """Handles user input and processes through agents."""
@@ -247,9 +360,13 @@ def user_query():
     if not user_input:
         return jsonify({"error": "No user input provided"}), 400
 
-    response = process_query(user_input)
+    verbose = request.args.get("verbose") == "1"
+    response = process_query(user_input, verbose=verbose)
     return jsonify({"Processed Query": response}), 200
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", debug=False, port=8008)
-    
\ No newline at end of file
+    # Werkzeug's dev server handles one request at a time, which serializes
+    # entire multi-agent conversations; waitress serves them concurrently.
+    # For production prefer: gunicorn -c gunicorn_conf.py main:app
+    from waitress import serve
+    serve(app, host="0.0.0.0", port=8008, threads=32)